@@ -5,19 +5,30 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
-import json
+import gzip
 import shutil
 import sys
-import tempfile
+import zlib
 from pathlib import Path
 from typing import Tuple
 from urllib.parse import urlparse
 
 import boto3
+import orjson
+from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 
+REPO_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(REPO_SRC) not in sys.path:  # script execution without `pip install -e .`
+    sys.path.insert(0, str(REPO_SRC))
+
+from qa_crawler.fileio import write_json_atomic  # noqa: E402
+
 
 DEFAULT_S3_URL = "https://express-block-maps.s3.us-east-2.amazonaws.com/block_map.json"
+# Adaptive retries back off on throttling (503 SlowDown) and transient 5xx
+# responses, so one blip doesn't fail the whole sync.
+S3_CLIENT_CONFIG = Config(retries={"max_attempts": 10, "mode": "adaptive"}, max_pool_connections=50)
 
 
 def parse_s3_url(url: str) -> Tuple[str, str]:
@@ -42,6 +53,22 @@ def parse_s3_url(url: str) -> Tuple[str, str]:
     raise ValueError(f"Unsupported S3 URL format: {url}")
 
 
+# What gzip.decompress raises for truncated or corrupt bodies.
+GZIP_DECODE_ERRORS = (OSError, EOFError, zlib.error)
+
+
+def decode_block_map_body(body: bytes, content_encoding: str | None) -> bytes:
+    """Undo the gzip Content-Encoding block maps are uploaded with; raw bodies pass through."""
+
+    if content_encoding == "gzip":
+        return gzip.decompress(body)
+    return body
+
+
+def make_s3_client():
+    return boto3.client("s3", config=S3_CLIENT_CONFIG)
+
+
 def archive_existing_block_map(block_map_path: Path, archive_dir: Path) -> Path | None:
     """Move the current block map into the archive directory, returning new location."""
 
@@ -61,28 +88,30 @@ def archive_existing_block_map(block_map_path: Path, archive_dir: Path) -> Path
     return archive_path
 
 
-def download_block_map(bucket: str, key: str, destination: Path) -> None:
+def download_block_map(bucket: str, key: str, destination: Path, client=None) -> None:
     """Download an S3 object and write it to destination, validating JSON."""
 
-    client = boto3.client("s3")
-    with tempfile.NamedTemporaryFile(delete=False) as tmp:
-        tmp_path = Path(tmp.name)
-
+    if client is None:
+        client = make_s3_client()
+    # The block map is read straight into memory and validated there, so there is
+    # no scratch file to write and read back.
     try:
-        client.download_file(bucket, key, str(tmp_path))
+        response = client.get_object(Bucket=bucket, Key=key)
+        body = response["Body"].read()
     except (BotoCoreError, ClientError) as exc:
-        tmp_path.unlink(missing_ok=True)
         raise RuntimeError(f"Failed to download s3://{bucket}/{key}: {exc}") from exc
 
     try:
-        data = json.loads(tmp_path.read_text(encoding="utf-8"))
+        body = decode_block_map_body(body, response.get("ContentEncoding"))
+    except GZIP_DECODE_ERRORS as exc:
+        raise ValueError(f"Downloaded file is not valid gzip: {exc}") from exc
+
+    try:
+        data = orjson.loads(body)
     except Exception as exc:
-        tmp_path.unlink(missing_ok=True)
         raise ValueError(f"Downloaded file is not valid JSON: {exc}") from exc
 
-    destination.parent.mkdir(parents=True, exist_ok=True)
-    destination.write_text(json.dumps(data, indent=2), encoding="utf-8")
-    tmp_path.unlink(missing_ok=True)
+    write_json_atomic(destination, data)
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -5,69 +5,100 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import orjson
+
+
+PreparedEntry = Tuple[str, FrozenSet[str], Dict[str, Any]]
+
+_COMMA_TO_SPACE = str.maketrans(",", " ")
 
 
 def load_block_map(map_path: Path) -> Dict[str, Dict[str, Any]]:
-    with map_path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    return orjson.loads(map_path.read_bytes())
 
 
 def normalize_classes(raw_classes: List[str]) -> List[str]:
-    joined = " ".join(raw_classes)
-    candidates = [token.strip().lower() for token in joined.replace(",", " ").split() if token.strip()]
-    seen: set[str] = set()
-    result: List[str] = []
-    for candidate in candidates:
-        if candidate in seen:
-            continue
-        seen.add(candidate)
-        result.append(candidate)
-    return result
-
-
-def jaccard_similarity(a: List[str], b: List[str]) -> float:
-    set_a = set(a)
-    set_b = set(b)
-    if not set_a and not set_b:
-        return 1.0
-    intersection = len(set_a & set_b)
-    union = len(set_a | set_b)
-    return intersection / union if union else 0.0
-
-
-def find_exact_match(query_classes: List[str], block_map: Dict[str, Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
-    query_set = set(query_classes)
-    for entry_id, entry in block_map.items():
-        entry_classes = [c.strip().lower() for c in entry.get("class_names", [])]
-        if set(entry_classes) == query_set:
+    tokens = " ".join(raw_classes).translate(_COMMA_TO_SPACE).lower().split()
+    # dict.fromkeys dedupes while keeping first-seen order.
+    return list(dict.fromkeys(tokens))
+
+
+def prepare_entries(block_map: Dict[str, Dict[str, Any]]) -> List[PreparedEntry]:
+    """Normalize every entry's class names once so queries only do set math."""
+
+    return [
+        (entry_id, frozenset(c.strip().lower() for c in entry.get("class_names", [])), entry)
+        for entry_id, entry in block_map.items()
+    ]
+
+
+def build_class_index(entries: List[PreparedEntry]) -> Dict[str, List[int]]:
+    """Map each class name to the positions of the entries that contain it."""
+
+    class_index: Dict[str, List[int]] = defaultdict(list)
+    for position, (_entry_id, entry_classes, _entry) in enumerate(entries):
+        for class_name in entry_classes:
+            class_index[class_name].append(position)
+    return dict(class_index)
+
+
+def find_exact_match(
+    query_classes: List[str],
+    entries: List[PreparedEntry],
+    class_index: Optional[Dict[str, List[int]]] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    query_set = frozenset(query_classes)
+    if class_index is None or not query_set:
+        positions: Iterable[int] = range(len(entries))
+    else:
+        # An exact match must appear in every query class's postings.
+        postings = sorted((class_index.get(c, []) for c in query_set), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        positions = sorted(candidates)
+    for position in positions:
+        entry_id, entry_classes, entry = entries[position]
+        if entry_classes == query_set:
             return entry_id, entry
     return "", {}
 
 
-def rank_close_matches(query_classes: List[str], block_map: Dict[str, Dict[str, Any]], top_k: int = 5) -> List[Tuple[str, float, Dict[str, Any]]]:
-    query_norm = [c.strip().lower() for c in query_classes]
-    candidates: List[Tuple[str, float, Dict[str, Any]]] = []
-    q_len = len(set(query_norm))
-
-    for entry_id, entry in block_map.items():
-        entry_classes = [c.strip().lower() for c in entry.get("class_names", [])]
-        score = jaccard_similarity(query_norm, entry_classes)
-        if score <= 0.0:
-            continue
-        candidates.append((entry_id, score, entry))
+def rank_close_matches(
+    query_classes: List[str],
+    entries: List[PreparedEntry],
+    class_index: Dict[str, List[int]],
+    top_k: int = 5,
+) -> List[Tuple[str, float, Dict[str, Any]]]:
+    query_set = frozenset(c.strip().lower() for c in query_classes)
+    q_len = len(query_set)
+
+    # Only entries sharing at least one class can score above zero, so count
+    # intersections from the postings instead of comparing against every entry.
+    intersections: Dict[int, int] = defaultdict(int)
+    for class_name in query_set:
+        for position in class_index.get(class_name, ()):
+            intersections[position] += 1
+
+    candidates: List[Tuple[str, float, int, Dict[str, Any]]] = []
+    for position, intersection in intersections.items():
+        entry_id, entry_classes, entry = entries[position]
+        entry_size = len(entry_classes)
+        score = intersection / (entry_size + q_len - intersection)
+        candidates.append((entry_id, score, entry_size, entry))
 
     candidates.sort(
         key=lambda item: (
             item[1],
-            -abs(len(set(item[2].get("class_names", []))) - q_len),
-            -len(item[2].get("class_names", [])),
+            -abs(item[2] - q_len),
+            -len(item[3].get("class_names", [])),
             item[0],
         ),
         reverse=True,
     )
-    return candidates[:top_k]
+    return [(entry_id, score, entry) for entry_id, score, _size, entry in candidates[:top_k]]
 
 
 def default_map_path() -> Path:
@@ -125,7 +156,9 @@ def main(argv: List[str]) -> int:
         print(f"Error: failed to load map file: {exc}", file=sys.stderr)
         return 2
 
-    entry_id, entry = find_exact_match(query_classes, block_map)
+    entries = prepare_entries(block_map)
+    class_index = build_class_index(entries)
+    entry_id, entry = find_exact_match(query_classes, entries, class_index)
     if entry_id:
         if args.output_json:
             print(
@@ -151,7 +184,7 @@ def main(argv: List[str]) -> int:
                 print(f"  - {url}")
         return 0
 
-    matches = rank_close_matches(query_classes, block_map, top_k=args.top_k)
+    matches = rank_close_matches(query_classes, entries, class_index, top_k=args.top_k)
     if args.output_json:
         print(
             json.dumps(
@@ -1,11 +1,19 @@
 #!/usr/bin/env python3
 import argparse
 import datetime as dt
-import json
 import os
 import shutil
+import sys
 from pathlib import Path
 
+import orjson
+
+REPO_SRC = Path(__file__).resolve().parents[1] / "src"
+if str(REPO_SRC) not in sys.path:  # script execution without `pip install -e .`
+    sys.path.insert(0, str(REPO_SRC))
+
+from qa_crawler.fileio import write_json_atomic  # noqa: E402
+
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Sync qa/block_map.json into qa-crawler/output/<YYYY-MM-DD>/block_map.json")
@@ -25,15 +33,13 @@ def main() -> int:
 
     # Validate JSON to avoid copying corrupt files
     try:
-        with qa_block_map.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = orjson.loads(qa_block_map.read_bytes())
     except Exception as e:
         print(f"Invalid JSON in {qa_block_map}: {e}")
         return 2
 
     # Write pretty JSON at destination
-    with out_file.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    write_json_atomic(out_file, data)
 
     print(f"Wrote {out_file}")
     return 0
@@ -5,19 +5,24 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
-import json
+import gzip
+import io
 import shutil
 import sys
 import tempfile
 from pathlib import Path
 
-import boto3
+import orjson
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import BotoCoreError, ClientError
 
 from download_from_s3 import (
     DEFAULT_S3_URL,
+    GZIP_DECODE_ERRORS,
     archive_existing_block_map,
+    decode_block_map_body,
     download_block_map,
+    make_s3_client,
     parse_s3_url,
 )
 
@@ -58,9 +63,20 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
+# Large block maps go up and down in parallel 8 MiB parts instead of one stream.
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True,
+)
+# CopyObject handles objects up to 5 GiB in a single request.
+SINGLE_COPY_LIMIT = 5 * 1024 * 1024 * 1024
+
+
 def validate_json_file(path: Path) -> None:
     try:
-        json.loads(path.read_text(encoding="utf-8"))
+        orjson.loads(path.read_bytes())
     except Exception as exc:  # pragma: no cover - defensive logging
         raise ValueError(f"{path} does not contain valid JSON: {exc}") from exc
 
@@ -75,7 +91,7 @@ def archive_remote_block_map(
     """Archive the current S3 object locally and in S3."""
 
     try:
-        client.head_object(Bucket=bucket, Key=key)
+        head = client.head_object(Bucket=bucket, Key=key)
     except ClientError as exc:
         code = exc.response.get("Error", {}).get("Code", "")
         if code in {"404", "NoSuchKey"}:
@@ -93,16 +109,24 @@ def archive_remote_block_map(
         tmp_path = Path(tmp.name)
 
     try:
-        client.download_file(bucket, key, str(tmp_path))
-        shutil.move(str(tmp_path), archive_path)
-    except (BotoCoreError, ClientError) as exc:
-        tmp_path.unlink(missing_ok=True)
+        try:
+            client.download_file(bucket, key, str(tmp_path), Config=TRANSFER_CONFIG)
+            if head.get("ContentEncoding") == "gzip":
+                tmp_path.write_bytes(decode_block_map_body(tmp_path.read_bytes(), "gzip"))
+            shutil.move(str(tmp_path), archive_path)
+        finally:
+            # Already gone after a successful move; otherwise never leave it behind.
+            tmp_path.unlink(missing_ok=True)
+    except (BotoCoreError, ClientError, *GZIP_DECODE_ERRORS) as exc:
         raise RuntimeError(f"Failed to archive s3://{bucket}/{key} locally: {exc}") from exc
 
     archive_key = f"past_block_maps/{archive_date}/{obj_name}"
     copy_source = {"Bucket": bucket, "Key": key}
     try:
-        client.copy(copy_source, bucket, archive_key)
+        if head.get("ContentLength", 0) < SINGLE_COPY_LIMIT:
+            client.copy_object(CopySource=copy_source, Bucket=bucket, Key=archive_key)
+        else:
+            client.copy(copy_source, bucket, archive_key, Config=TRANSFER_CONFIG)
     except (BotoCoreError, ClientError) as exc:
         raise RuntimeError(
             f"Failed to copy s3://{bucket}/{key} to s3://{bucket}/{archive_key}: {exc}"
@@ -117,9 +141,13 @@ def upload_block_map(
     key: str,
     source_path: Path,
 ) -> None:
-    extra_args = {"ContentType": "application/json"}
+    # Block maps repeat the same URLs and class names heavily, so gzip shrinks them
+    # several-fold. HTTP clients decode Content-Encoding: gzip transparently, and
+    # decode_block_map_body handles boto3 reads.
+    extra_args = {"ContentType": "application/json", "ContentEncoding": "gzip"}
+    body = gzip.compress(source_path.read_bytes(), mtime=0)
     try:
-        client.upload_file(str(source_path), bucket, key, ExtraArgs=extra_args)
+        client.upload_fileobj(io.BytesIO(body), bucket, key, ExtraArgs=extra_args, Config=TRANSFER_CONFIG)
     except (BotoCoreError, ClientError) as exc:
         raise RuntimeError(f"Failed to upload {source_path} to s3://{bucket}/{key}: {exc}") from exc
 
@@ -181,7 +209,7 @@ def main(argv: list[str] | None = None) -> int:
         if not source_path.exists():
             parser.error(f"Source not found: {source_path}")
 
-        client = boto3.client("s3")
+        client = make_s3_client()
         try:
             sync_upload(client, bucket, key, source_path, archive_dir, args.archive_date)
         except Exception as exc:
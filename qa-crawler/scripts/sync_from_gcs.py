@@ -4,29 +4,46 @@ import os
 from pathlib import Path
 
 
+DOWNLOAD_WORKERS = 16
+
+
 def _download_gcs_prefix(bucket_name: str, prefix: str, dest_dir: Path) -> int:
     try:
         from google.cloud import storage  # type: ignore
+        from google.cloud.storage import transfer_manager  # type: ignore
     except Exception as e:
         raise RuntimeError(
-            "google-cloud-storage is required. Please install dependencies and retry."
+            "google-cloud-storage>=2.14 is required. Please install dependencies and retry."
         ) from e
 
     client = storage.Client()
     bucket = client.bucket(bucket_name)
     dest_dir.mkdir(parents=True, exist_ok=True)
 
-    blobs_iter = client.list_blobs(bucket_or_name=bucket, prefix=prefix)
+    blobs = [
+        blob
+        for blob in client.list_blobs(bucket_or_name=bucket, prefix=prefix)
+        if not blob.name.endswith("/")
+    ]
+    if not blobs:
+        return 0
+
+    results = transfer_manager.download_many_to_path(
+        bucket,
+        [blob.name[len(prefix) :] for blob in blobs],
+        destination_directory=str(dest_dir),
+        blob_name_prefix=prefix,
+        max_workers=DOWNLOAD_WORKERS,
+        worker_type=transfer_manager.THREAD,
+    )
+
     count = 0
-    for blob in blobs_iter:
-        if blob.name.endswith("/"):
+    for blob, result in zip(blobs, results):
+        if isinstance(result, Exception):
+            print(f"Failed gs://{bucket_name}/{blob.name}: {result}")
             continue
-        relative = blob.name[len(prefix) :] if blob.name.startswith(prefix) else blob.name
-        local_path = dest_dir / relative
-        local_path.parent.mkdir(parents=True, exist_ok=True)
-        blob.download_to_filename(str(local_path))
         count += 1
-        print(f"Downloaded gs://{bucket_name}/{blob.name} -> {local_path}")
+        print(f"Downloaded gs://{bucket_name}/{blob.name} -> {dest_dir / blob.name[len(prefix) :]}")
     return count
 
 
@@ -12,9 +12,11 @@ CONTROL_SCREENSHOT_DIR = QA_DATA_DIR / "control"
 EXPERIMENTAL_SCREENSHOT_DIR = QA_DATA_DIR / "experimental"
 DIFF_SCREENSHOT_DIR = QA_DATA_DIR / "diff"
 DEFAULT_BLOCK_MAP = QA_DATA_DIR / "block_map.json"
-FAILED_URLS_PATH = QA_DATA_DIR / "failed_urls.json"
+FAILED_URLS_PATH = QA_DATA_DIR / "failed_urls.jsonl"
 SOURCE_FILES_PATH = QA_DATA_DIR / "source_files.json"
 
+_data_directories_ready = False
+
 
 def resolve_block_map_path(explicit_path: str | None = None) -> str:
     if explicit_path:
@@ -23,8 +25,11 @@ def resolve_block_map_path(explicit_path: str | None = None) -> str:
 
 
 def ensure_data_directories() -> None:
-    """Ensure on-disk directories required by loggers exist."""
+    """Ensure on-disk directories required by loggers exist (once per process)."""
 
+    global _data_directories_ready
+    if _data_directories_ready:
+        return
     for path in (
         DATA_DIR,
         QA_DATA_DIR,
@@ -34,3 +39,4 @@ def ensure_data_directories() -> None:
         DIFF_SCREENSHOT_DIR,
     ):
         path.mkdir(parents=True, exist_ok=True)
+    _data_directories_ready = True
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import json
+import html
 import random
 import re
 import sys
@@ -16,7 +16,7 @@ if __package__ is None or __package__ == "":  # pragma: no cover - script execut
     if str(repo_src) not in sys.path:
         sys.path.insert(0, str(repo_src))
 
-from bs4 import BeautifulSoup
+import orjson
 from dotenv import load_dotenv
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 
@@ -38,12 +38,50 @@ except Exception:  # pragma: no cover - when Pillow/Playwright extras unavailabl
 load_dotenv()
 print("Loaded environment variables")
 
-async def load_config(sitemap_file: str | Path) -> dict[str, Any]:
+# Resource types and hosts the crawler never inspects; aborting them keeps pages
+# from waiting on images, fonts, video and analytics beacons.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+BLOCKED_URL_PATTERN = re.compile(
+    r"adobedtm\.com|demdex\.net|omtrdc\.net|everesttech\.net|doubleclick\.net"
+    r"|google-analytics\.com|googletagmanager\.com|bing\.com/action",
+    re.IGNORECASE,
+)
+
+# Matches <loc> entries for Express pages directly on the raw sitemap bytes, so
+# filtering happens in the same pass as extraction.
+SITEMAP_LOC_PATTERN = re.compile(
+    rb"<loc>\s*(https://www\.adobe\.com/express/[^<\s]*)\s*</loc>",
+    re.IGNORECASE,
+)
+# Navigations allowed per second across both branches, shared by every page.
+NAVIGATIONS_PER_SECOND = 5.0
+
+MARTECH_PARAM_PATTERN = re.compile(r"([?&])martech=[^&#]*")
+URL_PATH_PATTERN = re.compile(r"^https?://[^/]+(/.*)?$")
+
+# Registered once per context so every page starts with animations disabled,
+# without extra evaluate round-trips per page.
+PAGE_INIT_SCRIPT = """
+(() => {
+  const disableAnimations = () => {
+    const style = document.documentElement.style;
+    style.setProperty('--animation-speed', '0s');
+    style.setProperty('transition', 'none');
+  };
+  if (document.documentElement) {
+    disableAnimations();
+  } else {
+    document.addEventListener('DOMContentLoaded', disableAnimations, { once: true });
+  }
+})();
+"""
+
+
+def load_config(sitemap_file: str | Path) -> dict[str, Any]:
     path = Path(sitemap_file)
     if not path.is_absolute():
         path = (SITEMAPS_DIR / path).resolve()
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    return orjson.loads(path.read_bytes())
 
 
 async def fetch_sitemap_urls(context, sitemap_url: str, timeout_ms: int = 60_000) -> list[str]:
@@ -51,83 +89,152 @@ async def fetch_sitemap_urls(context, sitemap_url: str, timeout_ms: int = 60_000
         response = await context.request.get(sitemap_url, timeout=timeout_ms)
         if not response.ok:
             raise RuntimeError(f"Sitemap request failed with status {response.status}")
-        text = await response.text()
+        body = await response.body()
     except Exception as exc:  # pragma: no cover - network errors surfaced to console
         print(f"Failed to fetch sitemap {sitemap_url}: {exc}")
         return []
 
-    urls: list[str] = []
-    try:
-        soup = BeautifulSoup(text, "xml")
-        for loc in soup.find_all("loc"):
-            loc_text = (loc.text or "").strip()
-            if loc_text.startswith("https://www.adobe.com/express/"):
-                urls.append(loc_text)
-    except Exception:
-        urls = []
-
-    if not urls:
-        urls = [
-            match.strip()
-            for match in re.findall(r"<loc>\s*(.*?)\s*</loc>", text, flags=re.IGNORECASE)
-            if match.startswith("https://www.adobe.com/express/")
-        ]
-
-    deduped: list[str] = []
-    seen: set[str] = set()
-    for candidate in urls:
-        if candidate in seen:
-            continue
-        seen.add(candidate)
-        deduped.append(candidate)
-    return deduped
+    # dict.fromkeys drops repeated <loc> entries while keeping sitemap order.
+    return list(
+        dict.fromkeys(
+            html.unescape(match.group(1).decode("utf-8")) for match in SITEMAP_LOC_PATTERN.finditer(body)
+        )
+    )
 
 
-async def get_urls_for_environment(urls: Iterable[str], environment: str) -> list[str]:
+def get_urls_for_environment(urls: Iterable[str], environment: str) -> list[str]:
+    host = environment.rstrip("/")
     environment_urls: list[str] = []
     for url in urls:
         if url.startswith("/"):
-            environment_urls.append(environment + url)
-        else:
-            location = url.split("//", 1)[1].split("/", 1)[1]
-            environment_urls.append(environment + "/" + location)
+            environment_urls.append(host + url)
+            continue
+        match = URL_PATH_PATTERN.match(url)
+        if match is None:
+            print(f"Skipping unsupported URL: {url}")
+            continue
+        environment_urls.append(host + (match.group(1) or "/"))
     return environment_urls
 
 
 async def get_urls(context, sitemap_file: str | Path) -> tuple[list[str], list[str]]:
-    config = await load_config(sitemap_file)
-    urls = config.get("urls", [])
+    config = load_config(sitemap_file)
+    # Manual lists get the same order-preserving dedup as sitemap results.
+    urls = list(dict.fromkeys(config.get("urls", [])))
     if not urls:
         urls = await fetch_sitemap_urls(context, config["sitemap_url"])
-    control_urls = await get_urls_for_environment(urls, config["control_branch_host"])
-    experimental_urls = await get_urls_for_environment(urls, config["experimental_branch_host"])
+    control_urls = get_urls_for_environment(urls, config["control_branch_host"])
+    experimental_urls = get_urls_for_environment(urls, config["experimental_branch_host"])
     return control_urls, experimental_urls
 
 
-async def process_page_with_context(context, url: str, environment: str, loggers: dict[str, Logger]):
-    page = None
+def with_martech_off(url: str) -> str:
+    """Return url with martech=off set, overriding any existing martech value."""
+    if MARTECH_PARAM_PATTERN.search(url):
+        return MARTECH_PARAM_PATTERN.sub(r"\1martech=off", url)
+    base, hash_mark, fragment = url.partition("#")
+    separator = "&" if "?" in base else "?"
+    return f"{base}{separator}martech=off{hash_mark}{fragment}"
+
+
+async def block_unneeded_requests(route) -> None:
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or BLOCKED_URL_PATTERN.search(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class PagePool:
+    """Fixed set of pages for one browser context, reused across URLs.
+
+    Navigating an existing page is cheaper than creating and tearing down a page
+    per URL; the pool size also bounds how many pages of a context are in flight.
+    """
+
+    def __init__(self, context, size: int) -> None:
+        self.context = context
+        self.size = size
+        self._idle: asyncio.Queue = asyncio.Queue()
+
+    async def open(self) -> None:
+        for _ in range(self.size):
+            self._idle.put_nowait(await self.context.new_page())
+
+    async def acquire(self):
+        page = await self._idle.get()
+        if page.is_closed():
+            try:
+                page = await self.context.new_page()
+            except Exception:
+                self._idle.put_nowait(page)
+                raise
+        return page
+
+    async def release(self, page, *, reusable: bool = True) -> None:
+        if reusable and not page.is_closed():
+            try:
+                # Stop the previous document's timers and requests while idle.
+                await page.goto("about:blank")
+            except Exception:
+                reusable = False
+        if not reusable and not page.is_closed():
+            try:
+                await page.close()
+            except Exception as close_exc:
+                print(f"Failed to close page: {close_exc}")
+        # Closed pages are replaced lazily by acquire().
+        self._idle.put_nowait(page)
+
+
+class NavigationThrottle:
+    """Token bucket spacing navigations evenly across all concurrent pages.
+
+    Politeness towards the origin is paid once per slot rather than as a fixed
+    idle sleep inside every page.
+    """
+
+    def __init__(self, rate_per_second: float) -> None:
+        self.interval = 1.0 / rate_per_second
+        self._lock = asyncio.Lock()
+        self._next_slot = 0.0
+
+    async def wait(self) -> None:
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def process_page_with_context(
+    page,
+    url: str,
+    environment: str,
+    loggers: dict[str, Logger],
+    throttle: NavigationThrottle | None = None,
+):
     try:
-        page = await context.new_page()
-        await page.evaluate("document.documentElement.style.setProperty('--animation-speed', '0s')")
-        await page.evaluate("document.documentElement.style.setProperty('transition', 'none')")
+        # Small jitter so pages released together don't queue in lockstep.
         await asyncio.sleep(random.randint(1, 5) / 10.0)
 
         for logger in loggers.values():
             await logger.init_on_page(page, url)
 
-        try:
-            from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
-
-            parsed = urlparse(url)
-            query_items = dict(parse_qsl(parsed.query, keep_blank_values=True))
-            query_items["martech"] = "off"
-            new_query = urlencode(query_items, doseq=True)
-            nav_url = urlunparse((parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment))
-        except Exception:
-            nav_url = url + ("&martech=off" if ("?" in url) else "?martech=off")
+        nav_url = with_martech_off(url)
 
+        if throttle is not None:
+            await throttle.wait()
         await page.goto(nav_url, wait_until="domcontentloaded", timeout=60_000)
-        await asyncio.sleep(random.randint(1, 5))
+        # Block scripts and stylesheets have run once "load" fires (images are blocked).
+        # Best effort: unblocked iframes or third-party scripts can hold "load" back
+        # while the DOM is already usable, so a slow load is not a page failure.
+        try:
+            await page.wait_for_load_state("load", timeout=45000)
+        except PlaywrightTimeoutError:
+            print(f"Load event not reached for {url}; continuing with the current DOM")
         await page.wait_for_selector("body", state="attached", timeout=45000)
     except PlaywrightTimeoutError as exc:
         if "failure" in loggers:
@@ -146,34 +253,33 @@ async def process_page_with_context(context, url: str, environment: str, loggers
             stack_trace = traceback.format_exc()
             await loggers["failure"].log(page, url, environment, error=exc, stack_trace=stack_trace)
     finally:
-        if page is not None:
-            for logger in loggers.values():
-                try:
-                    await logger.log(page, url, environment)
-                except Exception as log_exc:
-                    print(f"Logger {logger.__class__.__name__} failed for {url}: {log_exc}")
+        for logger in loggers.values():
             try:
-                await asyncio.shield(page.close())
-            except Exception as close_exc:
-                print(f"Failed to close page for {url}: {close_exc}")
+                await logger.log(page, url, environment)
+            except Exception as log_exc:
+                print(f"Logger {logger.__class__.__name__} failed for {url}: {log_exc}")
 
 
 async def run_page_with_timeout(
-    context,
+    pages: PagePool,
     url: str,
     environment: str,
     loggers: dict[str, Logger],
     timeout_seconds: float | None,
+    throttle: NavigationThrottle | None = None,
 ) -> None:
-    if timeout_seconds is None or timeout_seconds <= 0:
-        await process_page_with_context(context, url, environment, loggers)
-        return
-
+    page = None
+    reusable = False
     try:
-        await asyncio.wait_for(
-            process_page_with_context(context, url, environment, loggers),
-            timeout=timeout_seconds,
-        )
+        page = await pages.acquire()
+        if timeout_seconds is None or timeout_seconds <= 0:
+            await process_page_with_context(page, url, environment, loggers, throttle)
+        else:
+            await asyncio.wait_for(
+                process_page_with_context(page, url, environment, loggers, throttle),
+                timeout=timeout_seconds,
+            )
+        reusable = True
     except asyncio.TimeoutError:
         if "failure" in loggers:
             await loggers["failure"].log(
@@ -183,6 +289,16 @@ async def run_page_with_timeout(
                 error=f"Timed out after {timeout_seconds} seconds",
             )
         print(f"Timed out processing {url} ({environment}) after {timeout_seconds}s")
+    except Exception as exc:
+        # Typically acquire() failing to replace a closed page; record it for this
+        # URL instead of letting it escape gather() and abort the whole crawl.
+        if "failure" in loggers:
+            await loggers["failure"].log(None, url, environment, error=f"Could not open a page: {exc}")
+        print(f"Failed to process {url} ({environment}): {exc}")
+    finally:
+        # A page interrupted mid-navigation is not trusted for the next URL.
+        if page is not None:
+            await asyncio.shield(pages.release(page, reusable=reusable))
 
 
 async def run_crawl(
@@ -235,6 +351,9 @@ async def run_crawl(
 
         control_context = await browser.new_context(**context_options)
         experimental_context = await browser.new_context(**context_options)
+        for context in (control_context, experimental_context):
+            await context.add_init_script(PAGE_INIT_SCRIPT)
+            await context.route("**/*", block_unneeded_requests)
 
         control_urls, experimental_urls = await get_urls(control_context, sitemap_file)
         total_urls = min(limit, len(control_urls)) if limit > 0 else len(control_urls)
@@ -250,21 +369,31 @@ async def run_crawl(
             if hasattr(logger, "initialize") and callable(logger.initialize):
                 await logger.initialize()  # type: ignore[attr-defined]
 
+        # Each pool holds batch_size pages, so at most batch_size pages per environment
+        # are in flight and a finished page immediately picks up the next URL.
+        control_pages = PagePool(control_context, batch_size)
+        experimental_pages = PagePool(experimental_context, batch_size)
+        throttle = NavigationThrottle(NAVIGATIONS_PER_SECOND)
+        completed = 0
+
+        async def run_pooled(pages: PagePool, url: str, environment: str) -> None:
+            nonlocal completed
+            await run_page_with_timeout(pages, url, environment, loggers, page_timeout, throttle)
+            completed += 1
+            if completed % batch_size == 0:
+                print(f"Completed {completed} of {total_urls * 2} pages")
+
         try:
-            for index in range(0, total_urls, batch_size):
-                control_batch = control_urls[index : index + batch_size]
-                experimental_batch = experimental_urls[index : index + batch_size]
-                control_tasks = [
-                    run_page_with_timeout(control_context, url, "control", loggers, page_timeout)
-                    for url in control_batch
-                ]
-                experimental_tasks = [
-                    run_page_with_timeout(experimental_context, url, "experimental", loggers, page_timeout)
-                    for url in experimental_batch
-                ]
-                await asyncio.gather(*(control_tasks + experimental_tasks))
-                print(f"Completed batch {index // batch_size + 1}")
-                await asyncio.sleep(3)
+            await control_pages.open()
+            await experimental_pages.open()
+            tasks = []
+            for control_url, experimental_url in zip(
+                control_urls[:total_urls], experimental_urls[:total_urls]
+            ):
+                tasks.append(run_pooled(control_pages, control_url, "control"))
+                tasks.append(run_pooled(experimental_pages, experimental_url, "experimental"))
+            await asyncio.gather(*tasks)
+            print(f"Completed {completed} pages")
 
             for logger in loggers.values():
                 if hasattr(logger, "write_logs_async") and callable(logger.write_logs_async):
@@ -301,4 +430,8 @@ def main(argv: Iterable[str] | None = None) -> int:
 
 
 __all__ = ["main", "run_crawl", "build_parser"]
-main()
+
+# Guarded so that importing this module (the CLI shim, or the spawn/forkserver
+# workers of SourceLogger's parse pool re-importing __main__) never starts a crawl.
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,55 @@
+"""Atomic file replacement shared by the sync and download tools."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import stat
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+
+import orjson
+
+
+@contextmanager
+def atomic_writer(path: Path) -> Iterator[BinaryIO]:
+    """Yield a binary handle whose contents replace path only if the block succeeds.
+
+    Each call writes its own temporary file in path's directory, so concurrent
+    writers never share a scratch file, and the temporary file is removed on error.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = 0o644
+    handle = tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False)
+    try:
+        with handle:
+            yield handle
+            handle.flush()
+            # NamedTemporaryFile is created 0600; keep the permissions readers expect.
+            os.fchmod(handle.fileno(), mode)
+            os.fsync(handle.fileno())
+        os.replace(handle.name, path)
+    except BaseException:
+        try:
+            os.unlink(handle.name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """Replace path with data serialized as indented JSON."""
+    with atomic_writer(path) as handle:
+        handle.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+
+def copy_file_atomic(src: Path, path: Path) -> None:
+    """Replace path with a copy of src (sendfile on Linux)."""
+    with atomic_writer(path) as handle:
+        shutil.copyfile(src, handle.name)
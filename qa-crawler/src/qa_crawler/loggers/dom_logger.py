@@ -16,21 +16,25 @@ class DomLogger(Logger):
     async def log(self, page, url, environment):
         context = page.context
         cdp = await context.new_cdp_session(page)
-        await cdp.send(
-            "DOMSnapshot.captureSnapshot",
-            {
-                "computedStyles": [
-                    "display",
-                    "position",
-                    "top",
-                    "left",
-                    "width",
-                    "height",
-                    "margin",
-                    "padding",
-                ]
-            },
-        )
+        try:
+            await cdp.send(
+                "DOMSnapshot.captureSnapshot",
+                {
+                    "computedStyles": [
+                        "display",
+                        "position",
+                        "top",
+                        "left",
+                        "width",
+                        "height",
+                        "margin",
+                        "padding",
+                    ]
+                },
+            )
+        finally:
+            # Pages are pooled across URLs, so sessions must not outlive this call.
+            await cdp.detach()
         self.snapshot_count += 1
         print(f"DOM snapshot captured for {url} ({environment})")
 
@@ -1,15 +1,15 @@
-import json
 from typing import Any
 
+import orjson
+
 from .logger import Logger
-from qa_crawler.config import FAILED_URLS_PATH, ensure_data_directories
+from qa_crawler.config import FAILED_URLS_PATH
 
 
 class FailureLogger(Logger):
     def __init__(self) -> None:
         super().__init__()
         self.failed_urls: list[dict[str, Any]] = []
-        ensure_data_directories()
 
     async def init_on_page(self, page, url) -> None:  # pragma: no cover - interface hook
         return None
@@ -28,25 +28,14 @@ class FailureLogger(Logger):
             print(stack_trace)
 
     def write_logs(self) -> None:
-        try:
-            existing_failed_urls = json.loads(FAILED_URLS_PATH.read_text(encoding="utf-8"))
-        except FileNotFoundError:
-            existing_failed_urls = []
-
-        existing_combinations = {
-            (item.get("url"), item.get("environment"))
-            for item in existing_failed_urls
-        }
-
-        for new_failure in self.failed_urls:
-            combo = (new_failure.get("url"), new_failure.get("environment"))
-            if combo not in existing_combinations:
-                existing_failed_urls.append(new_failure)
-
+        # Append-only JSONL history: each run writes just its own failures instead
+        # of re-reading and re-serializing the whole file. Records are not
+        # deduplicated, so a page failing on every run appears once per run.
         FAILED_URLS_PATH.parent.mkdir(parents=True, exist_ok=True)
-        FAILED_URLS_PATH.write_text(json.dumps(existing_failed_urls, indent=2), encoding="utf-8")
-        print(f"Failed URLs saved to {FAILED_URLS_PATH} (merged {len(self.failed_urls)} new failures)")
-        print(f"Total failures: {len(existing_failed_urls)}")
+        with FAILED_URLS_PATH.open("ab") as handle:
+            for failure in self.failed_urls:
+                handle.write(orjson.dumps(failure) + b"\n")
+        print(f"Failed URLs appended to {FAILED_URLS_PATH} ({len(self.failed_urls)} new failures)")
 
     def get_failure_count(self) -> int:
         return len(self.failed_urls)
@@ -1,12 +1,13 @@
+import asyncio
 import shutil
 from pathlib import Path
+from urllib.parse import urlsplit
 
 from .logger import Logger
 from qa_crawler.config import (
     CONTROL_SCREENSHOT_DIR,
     DIFF_SCREENSHOT_DIR,
     EXPERIMENTAL_SCREENSHOT_DIR,
-    ensure_data_directories,
 )
 
 
@@ -17,7 +18,6 @@ class ScreenshotLogger(Logger):
         self._clear_screenshot_directories()
 
     def _clear_screenshot_directories(self):
-        ensure_data_directories()
         for directory in (CONTROL_SCREENSHOT_DIR, EXPERIMENTAL_SCREENSHOT_DIR, DIFF_SCREENSHOT_DIR):
             if directory.exists():
                 shutil.rmtree(directory)
@@ -28,12 +28,14 @@ class ScreenshotLogger(Logger):
         pass
 
     async def log(self, page, url, environment):
-        location = url.split("//")[1].split("/", 1)[1]
+        location = urlsplit(url).path.lstrip("/")
         safe_url = location.replace('/', '_').replace('.', '_')
         await self.scroll_to_bottom(page)
         target_dir = CONTROL_SCREENSHOT_DIR if environment == "control" else EXPERIMENTAL_SCREENSHOT_DIR
-        target_dir.mkdir(parents=True, exist_ok=True)
-        await page.screenshot(path=str(target_dir / f"{safe_url}.png"), full_page=True)
+        # Capture to memory and write from a worker thread so the event loop can
+        # move on to other pages while the PNG hits disk.
+        png_bytes = await page.screenshot(full_page=True, type="png")
+        await asyncio.to_thread((target_dir / f"{safe_url}.png").write_bytes, png_bytes)
         self.screenshot_count += 1
         print(f"Screenshot taken for {url} ({environment})")
 
@@ -44,17 +46,17 @@ class ScreenshotLogger(Logger):
         return self.screenshot_count
 
     async def scroll_to_bottom(self, page):
-        dimensions = await page.evaluate("""() => {
-            return {
-                width: document.documentElement.scrollWidth,
-                height: document.documentElement.scrollHeight,
-                viewportHeight: window.innerHeight
+        # One evaluate for the whole scroll instead of a round-trip per viewport step.
+        await page.evaluate("""async () => {
+            const height = document.documentElement.scrollHeight;
+            const step = window.innerHeight;
+            const pause = () => new Promise(resolve => setTimeout(resolve, 50));
+            let position = 0;
+            while (position < height) {
+                window.scrollTo(0, position);
+                await pause();
+                position += step;
             }
+            window.scrollTo(0, position);
+            await pause();
         }""")
-        current_position = 0
-        while current_position < dimensions['height']:
-            await page.evaluate(f"window.scrollTo(0, {current_position})")
-            await page.wait_for_timeout(50)
-            current_position += dimensions['viewportHeight']
-        await page.evaluate(f"window.scrollTo(0, {current_position})")
-        await page.wait_for_timeout(50)
@@ -1,8 +1,13 @@
+import asyncio
+import functools
 import hashlib
-import json
-from concurrent.futures import ThreadPoolExecutor
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
-from bs4 import BeautifulSoup
+import orjson
+from lxml import etree
 
 from .logger import Logger
 from qa_crawler.config import (
@@ -13,21 +18,112 @@ from qa_crawler.config import (
 )
 
 
+# block_map.json is keyed by these digests, so the algorithm stays SHA-256; the
+# class vocabulary is small and repeats across pages, so memoizing is cheap.
+@functools.lru_cache(maxsize=None)
+def block_hash(class_str: str) -> str:
+    """Return the block-map key for a sorted, space-joined class string."""
+    return hashlib.sha256(class_str.encode()).hexdigest()
+
+
+def snapshot_path_for(url):
+    return DOM_SNAPSHOT_DIR / f"{url.replace('://', '_').replace('/', '_')}.html"
+
+
+def _is_section(element):
+    return 'section' in (element.get('class') or '').split()
+
+
+def _append_section_blocks(section, blocks):
+    # iterchildren filters in C and skips comments/PIs without an XPath context.
+    for element in section.iterchildren(etree.Element):
+        class_attr = element.get('class') or ''
+        class_names = class_attr.split()
+        if class_names:
+            blocks.append(class_names)
+            # Substring test on the raw attribute rules out most elements before
+            # the per-class suffix check.
+            if '-wrapper' in class_attr and any(cls.endswith('-wrapper') for cls in class_names):
+                for child in element.iterchildren("div"):
+                    child_classes = (child.get('class') or '').split()
+                    if child_classes:
+                        blocks.append(child_classes)
+
+
+def _collect_blocks(handle, label):
+    """Return the class lists of every block inside <main> sections of an HTML stream.
+
+    The document is streamed with iterparse and each finished top-level section is
+    cleared, so memory stays bounded by one section rather than the whole page.
+    """
+    blocks = []
+    main_depth = 0
+    section_depth = 0
+    found_main = False
+    for event, element in etree.iterparse(handle, events=("start", "end"), html=True, encoding="utf-8"):
+        if element.tag == "main":
+            found_main = True
+            main_depth += 1 if event == "start" else -1
+            continue
+        if not main_depth or not _is_section(element):
+            continue
+        if event == "start":
+            section_depth += 1
+            continue
+        section_depth -= 1
+        _append_section_blocks(element, blocks)
+        if section_depth == 0:
+            # Nested sections are handled before their parent, so only
+            # free the outermost one (and siblings already processed).
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+    if not found_main:
+        print(f"No main element found in {label}")
+    return blocks
+
+
+def _collect_html_blocks(url, html_bytes):
+    """Process-pool entry point: parse a page's HTML straight from memory."""
+    try:
+        return _collect_blocks(io.BytesIO(html_bytes), url)
+    except Exception as e:
+        print(f"Error processing DOM for {url}: {e}")
+    return []
+
+
+def _parse_pool_context():
+    # The pool is started from inside the event loop while other threads are
+    # running; forking that process can deadlock the child, so never use "fork".
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
 class SourceLogger(Logger):
     def __init__(self):
         super().__init__()
         self.source_dict = {}
-        self.block_map = {}
-        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="snapshot_writer")
-        self.pending_snapshots = set()  # Track URLs with pending snapshots
+        self.block_map = {}  # sorted class tuple -> {"class_names", "urls"}; hashed on write
+        self.response_handlers = {}  # Active "response" listener per (pooled) page
+        self.parse_pool = None  # Created by initialize(); parsing is CPU-bound
         ensure_data_directories()
 
+    async def initialize(self):
+        if self.parse_pool is None:
+            self.parse_pool = ProcessPoolExecutor(mp_context=_parse_pool_context())
+
     async def init_on_page(self, page, url):
-        self.source_dict[url] = []
-        self.block_map = {}
+        self.source_dict[url] = set()
         self.page = page
         self.pending_requests = 0
-        page.on("response", lambda response: self._filter_source_files(response.request.url, self.source_dict[url]))
+        # Pages are reused across URLs, so drop the listener left by the previous URL.
+        previous_handler = self.response_handlers.pop(page, None)
+        if previous_handler is not None:
+            page.remove_listener("response", previous_handler)
+        source_files = self.source_dict[url]
+        handler = lambda response: self._filter_source_files(response.request.url, source_files)
+        self.response_handlers[page] = handler
+        page.on("response", handler)
 
     async def log(self, page, url, environment):
         if page.is_closed():
@@ -40,66 +136,85 @@ class SourceLogger(Logger):
             print(f"Unable to capture DOM snapshot for {url}: {exc}")
             return
 
-        self.pending_snapshots.add(url)
-        self.executor.submit(self._write_snapshot_threaded, url, html_content)
-
-    def _write_snapshot_threaded(self, url, html_content):
+        # Blocks come from the HTML already in memory; the snapshot file is only
+        # kept for debugging, so the write and the parse run side by side.
+        html_bytes = html_content.encode("utf-8")
+        _, blocks = await asyncio.gather(
+            asyncio.to_thread(self._write_snapshot, url, html_bytes),
+            self._parse_blocks(url, html_bytes),
+        )
+        for classes in blocks:
+            self._add_block_entry(classes, url)
+
+    async def _parse_blocks(self, url, html_bytes):
+        pool = self.parse_pool
+        if pool is not None:
+            try:
+                return await asyncio.get_running_loop().run_in_executor(pool, _collect_html_blocks, url, html_bytes)
+            except BrokenProcessPool as exc:
+                # A dead worker breaks the pool for good; keep collecting blocks
+                # in-process rather than dropping every remaining page.
+                if self.parse_pool is pool:
+                    print(f"Block parser pool failed ({exc}); parsing in-process for the rest of the crawl")
+                    self.parse_pool = None
+                    pool.shutdown(wait=False, cancel_futures=True)
+        return await asyncio.to_thread(_collect_html_blocks, url, html_bytes)
+
+    def _write_snapshot(self, url, html_bytes):
         try:
-            safe_name = url.replace("://", "_").replace("/", "_") + ".html"
-            output_path = DOM_SNAPSHOT_DIR / safe_name
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(html_content, encoding="utf-8")
-            print(f"DOM snapshot saved to {output_path}")
+            # No per-page success line: run_crawl already reports progress per batch.
+            snapshot_path_for(url).write_bytes(html_bytes)
         except Exception as e:
             print(f"Error writing snapshot for {url}: {e}")
-        finally:
-            self.pending_snapshots.discard(url)
 
     def write_logs(self):
-        print("Waiting for snapshot writing to complete...")
-        self.executor.shutdown(wait=True)
-        print("Processing snapshots...")
-        for url in self.source_dict.keys():
-            self.query_dom_snapshot(url)
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown()
+            self.parse_pool = None
 
         existing_source_files = {}
         existing_block_map = {}
         try:
-            existing_source_files = json.loads(SOURCE_FILES_PATH.read_text(encoding="utf-8"))
+            existing_source_files = orjson.loads(SOURCE_FILES_PATH.read_bytes())
         except FileNotFoundError:
             pass
         try:
-            existing_block_map = json.loads(DEFAULT_BLOCK_MAP.read_text(encoding="utf-8"))
+            existing_block_map = orjson.loads(DEFAULT_BLOCK_MAP.read_bytes())
         except FileNotFoundError:
             pass
 
+        # URL collections are sets while crawling; they become sorted lists only here.
         for url, sources in self.source_dict.items():
-            if url in existing_source_files:
-                existing_source_files[url] = list(set(existing_source_files[url] + sources))
-            else:
-                existing_source_files[url] = sources
-
-        for hash_key, hash_data in self.block_map.items():
-            if hash_key in existing_block_map:
-                existing_urls = set(existing_block_map[hash_key].get('urls', []))
-                new_urls = set(hash_data.get('urls', []))
-                existing_block_map[hash_key]['urls'] = list(existing_urls | new_urls)
-                existing_block_map[hash_key]['class_names'] = hash_data.get('class_names', [])
+            merged = set(existing_source_files.get(url, ()))
+            merged |= sources
+            existing_source_files[url] = sorted(merged)
+
+        for class_key, hash_data in self.block_map.items():
+            hash_key = block_hash(' '.join(class_key))
+            existing_entry = existing_block_map.get(hash_key)
+            if existing_entry is not None:
+                merged = set(existing_entry.get('urls', ()))
+                merged |= hash_data['urls']
+                existing_entry['urls'] = sorted(merged)
+                existing_entry['class_names'] = hash_data['class_names']
             else:
-                existing_block_map[hash_key] = hash_data
+                existing_block_map[hash_key] = {
+                    "class_names": hash_data['class_names'],
+                    "urls": sorted(hash_data['urls']),
+                }
 
         SOURCE_FILES_PATH.parent.mkdir(parents=True, exist_ok=True)
-        SOURCE_FILES_PATH.write_text(json.dumps(existing_source_files, indent=2), encoding="utf-8")
+        SOURCE_FILES_PATH.write_bytes(orjson.dumps(existing_source_files, option=orjson.OPT_INDENT_2))
         print(f"Source files saved to {SOURCE_FILES_PATH} (merged {len(self.source_dict)} new entries)")
 
         DEFAULT_BLOCK_MAP.parent.mkdir(parents=True, exist_ok=True)
-        DEFAULT_BLOCK_MAP.write_text(json.dumps(existing_block_map, indent=2), encoding="utf-8")
+        DEFAULT_BLOCK_MAP.write_bytes(orjson.dumps(existing_block_map, option=orjson.OPT_INDENT_2))
         print(f"Block map saved to {DEFAULT_BLOCK_MAP} (merged {len(self.block_map)} new entries)")
 
     def _filter_source_files(self, response_url, source_files):
         block_path = "/express/code/blocks/"
         if response_url.endswith(".js") and block_path in response_url:
-            source_files.append(response_url)
+            source_files.add(response_url)
 
     async def query_variants(self, block_name):
         output = []
@@ -118,52 +233,17 @@ class SourceLogger(Logger):
         hash_map = {}
         for variant_array in variants:
             variant_str = ' '.join(sorted(variant_array))
-            variant_hash = hashlib.sha256(variant_str.encode()).hexdigest()
+            variant_hash = block_hash(variant_str)
             hash_map[variant_hash] = variant_array
         return hash_map
 
-    def query_dom_snapshot(self, url):
-        snapshot_path = DOM_SNAPSHOT_DIR / f"{url.replace('://', '_').replace('/', '_')}.html"
-        try:
-            html_content = snapshot_path.read_text(encoding="utf-8")
-            soup = BeautifulSoup(html_content, 'html.parser')
-            main_element = soup.find('main')
-            if not main_element:
-                print(f"No main element found in {snapshot_path}")
-                return
-            section_elements = main_element.find_all(class_='section', recursive=True)
-            for section in section_elements:
-                direct_children = section.find_all(recursive=False)
-                for element in direct_children:
-                    def add_block_entry(classes: list[str]):
-                        if not classes:
-                            return
-                        sorted_class_names = sorted(classes)
-                        class_str = ' '.join(sorted_class_names)
-                        element_hash = hashlib.sha256(class_str.encode()).hexdigest()
-                        if element_hash not in self.block_map:
-                            self.block_map[element_hash] = {
-                                "class_names": classes,
-                                "urls": []
-                            }
-                        if url not in self.block_map[element_hash]["urls"]:
-                            self.block_map[element_hash]["urls"].append(url)
-
-                    class_names = element.get('class', [])
-                    if class_names:
-                        add_block_entry(class_names)
-                        if any(cls.endswith('-wrapper') for cls in class_names):
-                            child_divs = element.find_all('div', recursive=False)
-                            for child in child_divs:
-                                child_classes = child.get('class', [])
-                                add_block_entry(child_classes)
-    
-        except FileNotFoundError:
-            print(f"Snapshot file not found: {snapshot_path}")
-        except Exception as e:
-            print(f"Error processing snapshot {snapshot_path}: {e}")
-
-    def cleanup(self):
-        if hasattr(self, 'executor') and self.executor:
-            self.executor.shutdown(wait=True)
-            print("SourceLogger thread executor shutdown complete")
+    def _add_block_entry(self, classes, url):
+        if not classes:
+            return
+        class_key = tuple(sorted(classes))
+        if class_key not in self.block_map:
+            self.block_map[class_key] = {
+                "class_names": classes,
+                "urls": set()
+            }
+        self.block_map[class_key]["urls"].add(url)
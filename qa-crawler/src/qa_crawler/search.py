@@ -1,20 +1,32 @@
 #!/usr/bin/env python3
 import argparse
-import json
+import itertools
 import os
 import re
-from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+import sys
 from pathlib import Path
 from typing import Any, Dict, List, Tuple, Set, Optional
 
+import numpy as np
+import orjson
 from rapidfuzz import process, fuzz
 
 from .config import DEFAULT_BLOCK_MAP, OUTPUT_DIR
 
 
 def load_block_map(path: str) -> Dict[str, Any]:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    block_map = orjson.loads(Path(path).read_bytes())
+    # Class names and page URLs repeat across thousands of entries; interning
+    # shares one string object per distinct value instead of one per occurrence.
+    intern = sys.intern
+    for data in block_map.values():
+        if not isinstance(data, dict):
+            continue
+        if data.get("class_names"):
+            data["class_names"] = [intern(c) for c in data["class_names"]]
+        if data.get("urls"):
+            data["urls"] = [intern(u) for u in data["urls"]]
+    return block_map
 
 
 def build_corpus(block_map: Dict[str, Any]) -> List[str]:
@@ -31,28 +43,61 @@ def tokenize_query(query: str) -> List[str]:
     return [t.strip().lower() for t in query.split() if t.strip()]
 
 
-def exact_match_urls(block_map: Dict[str, Any], tokens: List[str]) -> List[str]:
+def build_index(block_map: Dict[str, Any]) -> Dict[str, Dict[str, None]]:
+    """Map each lowercased class name to the hash keys containing it.
+
+    Postings are dicts so membership checks are O(1) while keys stay in
+    block-map order.
+    """
+    index: Dict[str, Dict[str, None]] = {}
+    for hash_key, data in block_map.items():
+        for c in data.get("class_names", []) or []:
+            index.setdefault(c.lower(), {})[hash_key] = None
+    return index
+
+
+def exact_match_urls(
+    block_map: Dict[str, Any], tokens: List[str], index: Optional[Dict[str, Dict[str, None]]] = None
+) -> List[str]:
     if not tokens:
         return []
+    if index is None:
+        index = build_index(block_map)
+    postings = [index.get(t) for t in dict.fromkeys(tokens)]
+    if not all(postings):
+        return []
+    # Walk the smallest posting list and probe the others.
+    postings.sort(key=len)
+    smallest, rest = postings[0], postings[1:]
     exact_urls: List[str] = []
     seen: Set[str] = set()
-    for _hash_key, data in block_map.items():
-        class_names = [c.lower() for c in (data.get("class_names", []) or [])]
-        class_set = set(class_names)
-        if all(t in class_set for t in tokens):
-            for u in data.get("urls", []) or []:
-                if u not in seen:
-                    seen.add(u)
-                    exact_urls.append(u)
+    for hash_key in smallest:
+        if not all(hash_key in p for p in rest):
+            continue
+        for u in block_map[hash_key].get("urls", []) or []:
+            if u not in seen:
+                seen.add(u)
+                exact_urls.append(u)
     return exact_urls
 
 
-def top_similar_combinations(block_map: Dict[str, Any], query: str, top_k: int = 5) -> List[Tuple[str, int, str]]:
+def build_combinations(block_map: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """Return the unique normalized class-name combos and the first hash key of each."""
     combos: List[str] = []
     keys: List[str] = []
     seen_combo: Set[str] = set()
+    # The class vocabulary is small and heavily repeated; normalize each name once.
+    normalized_names: Dict[str, str] = {}
     for hash_key, data in block_map.items():
-        classes = [c.strip().lower() for c in (data.get("class_names", []) or []) if c and c.strip()]
+        classes = []
+        for c in data.get("class_names", []) or []:
+            if not c:
+                continue
+            name = normalized_names.get(c)
+            if name is None:
+                name = normalized_names[c] = sys.intern(c.strip().lower())
+            if name:
+                classes.append(name)
         combo = " ".join(sorted(classes))
         if not combo:
             continue
@@ -61,13 +106,58 @@ def top_similar_combinations(block_map: Dict[str, Any], query: str, top_k: int =
         seen_combo.add(combo)
         combos.append(combo)
         keys.append(hash_key)
-    if not combos or not query.strip():
+    return combos, keys
+
+
+def top_similar_combinations(
+    block_map: Dict[str, Any],
+    query: str,
+    top_k: int = 5,
+    min_score: int = 0,
+    combinations: Optional[Tuple[List[str], List[str]]] = None,
+) -> List[Tuple[str, int, str]]:
+    if not 0 <= min_score <= 100:
+        raise ValueError(f"min_score must be between 0 and 100, got {min_score}")
+    combos, keys = combinations if combinations is not None else build_combinations(block_map)
+    normalized_query = query.strip().lower()
+    if not combos or not normalized_query or top_k <= 0:
         return []
-    results = process.extract(query.strip().lower(), combos, scorer=fuzz.token_set_ratio, limit=top_k)
-    output: List[Tuple[str, int, str]] = []
-    for combo_str, score, idx in results:
-        output.append((combo_str, int(score), keys[idx]))
-    return output
+    # Query and combos are already lowercased and stripped, so skip rapidfuzz's
+    # processor and score the whole list in one C++ call across all cores. A
+    # score_cutoff lets rapidfuzz abandon hopeless candidates early (they score 0).
+    scores = process.cdist(
+        [normalized_query],
+        combos,
+        scorer=fuzz.token_set_ratio,
+        processor=None,
+        score_cutoff=min_score or None,
+        workers=-1,
+    )[0]
+    if min_score:
+        top = np.flatnonzero(scores >= min_score)
+    elif top_k < len(combos):
+        # Partial selection finds the cut-off score in O(n); only entries at or
+        # above it get sorted. Ties keep block-map order, as process.extract did.
+        threshold = np.partition(scores, len(combos) - top_k)[len(combos) - top_k]
+        top = np.flatnonzero(scores >= threshold)
+    else:
+        top = np.arange(len(combos))
+    top = top[np.argsort(-scores[top], kind="stable")][:top_k]
+    return [(combos[i], int(scores[i]), keys[i]) for i in top]
+
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def _looks_dated(name: str) -> bool:
+    """Cheap YYYY-MM-DD check; only names that pass the shape test hit the regex."""
+    return len(name) == 10 and name[4] == "-" and name[7] == "-" and _DATE_RE.match(name) is not None
+
+
+def _dated_dir_names(output_dir: Path) -> Tuple[str, ...]:
+    """Dated folder names under output_dir, newest first."""
+    with os.scandir(output_dir) as entries:
+        return tuple(sorted((e.name for e in entries if _looks_dated(e.name) and e.is_dir()), reverse=True))
 
 
 def resolve_block_map_path(date: Optional[str], explicit_path: Optional[str]) -> str:
@@ -75,16 +165,13 @@ def resolve_block_map_path(date: Optional[str], explicit_path: Optional[str]) ->
         return explicit_path
     output_dir = OUTPUT_DIR
     candidate: Optional[Path] = None
-    date_pattern = re.compile(r"^\d{4}-\d{2}-\d{2}$")
     if date:
         candidate = output_dir / date / "block_map.json"
         if not candidate.exists():
             candidate = None
     if candidate is None and output_dir.exists():
-        dated_dirs = [p for p in output_dir.iterdir() if p.is_dir() and date_pattern.match(p.name)]
-        dated_dirs.sort(key=lambda p: p.name, reverse=True)
-        for d in dated_dirs:
-            bm = d / "block_map.json"
+        for name in _dated_dir_names(output_dir):
+            bm = output_dir / name / "block_map.json"
             if bm.exists():
                 candidate = bm
                 break
@@ -93,12 +180,16 @@ def resolve_block_map_path(date: Optional[str], explicit_path: Optional[str]) ->
     return str(candidate)
 
 
+_BRANCH_RE = re.compile(r"^(https://)([^/]+?)--(.*)$")
+_MARTECH_PARAM_RE = re.compile(r"[?&]martech(?:[=&]|$)")
+
+
 def rewrite_branch_url(url: str, branch_name: str) -> str:
     """If URL matches https://<branch>--<rest>, replace <branch> with branch_name.
 
     Only rewrites when the pattern with "https://" and at least one "--" is found.
     """
-    m = re.match(r"^(https://)([^/]+?)--(.*)$", url)
+    m = _BRANCH_RE.match(url)
     if not m:
         return url
     scheme, _old_branch, rest = m.groups()
@@ -107,41 +198,38 @@ def rewrite_branch_url(url: str, branch_name: str) -> str:
 
 def add_martech_off(url: str) -> str:
     """Append martech=off to the query string if not already present."""
-    parsed = urlparse(url)
-    query_items = dict(parse_qsl(parsed.query, keep_blank_values=True))
-    if "martech" not in query_items:
-        query_items["martech"] = "off"
-    new_query = urlencode(query_items, doseq=True)
-    new_parsed = parsed._replace(query=new_query)
-    return urlunparse(new_parsed)
+    base, hash_mark, fragment = url.partition("#")
+    if _MARTECH_PARAM_RE.search(base):
+        return url
+    separator = "&" if "?" in base else "?"
+    if base.endswith(("?", "&")):
+        separator = ""
+    return f"{base}{separator}martech=off{hash_mark}{fragment}"
 
 
 def unique_preserve_order(items: List[str]) -> List[str]:
-    seen: Set[str] = set()
-    out: List[str] = []
-    for x in items:
-        if x in seen:
-            continue
-        seen.add(x)
-        out.append(x)
-    return out
+    return list(dict.fromkeys(items))
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description="Segmented search: URLs with exact keyword match and top similar class-name combinations")
-    parser.add_argument("query", help="Keyword(s) to search for; space-separated tokens")
-    parser.add_argument("--date", default=None, help="Date folder under output (YYYY-MM-DD). If omitted, uses most recent date.")
-    parser.add_argument("--path", default=None, help="Explicit path to block_map.json (overrides --date)")
-    parser.add_argument("--limit", type=int, default=0, help="Max URLs to print for exact matches (0 = no limit)")
-    parser.add_argument("--branch", default=None, help="If provided, rewrite printed URLs to use this branch before the first --")
-    args = parser.parse_args()
+class Searcher:
+    """Hold a parsed block map and its lookup structures across many queries."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.block_map = load_block_map(path)
+        self.inverted_index = build_index(self.block_map)
+        self.combos, self.keys = build_combinations(self.block_map)
 
-    resolved_path = resolve_block_map_path(args.date, args.path)
-    block_map = load_block_map(resolved_path)
-    tokens = tokenize_query(args.query)
+    def query(self, query: str, top_k: int = 5, min_score: int = 0) -> Tuple[List[str], List[Tuple[str, int, str]]]:
+        """Return (exact-match URLs, top similar class-name combinations) for query."""
+        exact_urls = exact_match_urls(self.block_map, tokenize_query(query), index=self.inverted_index)
+        combos = top_similar_combinations(
+            self.block_map, query, top_k=top_k, min_score=min_score, combinations=(self.combos, self.keys)
+        )
+        return exact_urls, combos
 
-    exact_urls = exact_match_urls(block_map, tokens)
 
+def print_results(args: argparse.Namespace, exact_urls: List[str], combos: List[Tuple[str, int, str]]) -> None:
     # Optionally rewrite URLs to use provided branch name, append martech=off, and ensure uniqueness post-rewrite
     if args.branch:
         rewritten = [rewrite_branch_url(u, args.branch) for u in exact_urls]
@@ -151,12 +239,6 @@ def main() -> int:
     if args.limit and args.limit > 0:
         exact_urls = exact_urls[: args.limit]
 
-    # Optionally rewrite URLs to use provided branch name
-    if args.branch:
-        exact_urls = [rewrite_branch_url(u, args.branch) for u in exact_urls]
-
-    combos = top_similar_combinations(block_map, args.query, top_k=5)
-
     print("Exact match (all keywords):")
     if not exact_urls:
         print("(none)")
@@ -170,6 +252,39 @@ def main() -> int:
     else:
         for combo_str, s, _h in combos:
             print(f"{combo_str} ({s})")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Segmented search: URLs with exact keyword match and top similar class-name combinations")
+    parser.add_argument("query", nargs="?", help="Keyword(s) to search for; space-separated tokens")
+    parser.add_argument("--date", default=None, help="Date folder under output (YYYY-MM-DD). If omitted, uses most recent date.")
+    parser.add_argument("--path", default=None, help="Explicit path to block_map.json (overrides --date)")
+    parser.add_argument("--limit", type=int, default=0, help="Max URLs to print for exact matches (0 = no limit)")
+    parser.add_argument("--branch", default=None, help="If provided, rewrite printed URLs to use this branch before the first --")
+    parser.add_argument("--min-score", type=int, default=0, help="Drop similar combinations scoring below this (0-100, default 0 = keep all)")
+    parser.add_argument("--repl", action="store_true", help="Read one query per line from stdin, loading the block map only once")
+    args = parser.parse_args()
+    if not args.repl and not args.query:
+        parser.error("query is required unless --repl is given")
+    if not 0 <= args.min_score <= 100:
+        parser.error("--min-score must be between 0 and 100")
+
+    searcher = Searcher(resolve_block_map_path(args.date, args.path))
+    queries = [args.query] if args.query else []
+    if args.repl:
+        queries = itertools.chain(queries, (line.strip() for line in sys.stdin))
+    first = True
+    for query in queries:
+        if not query:
+            continue
+        if not first:
+            print()
+        first = False
+        if args.repl:
+            print(f"> {query}")
+        exact_urls, combos = searcher.query(query, top_k=5, min_score=args.min_score)
+        print_results(args, exact_urls, combos)
+        sys.stdout.flush()
     return 0
 
 
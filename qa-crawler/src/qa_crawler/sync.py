@@ -1,50 +1,142 @@
 #!/usr/bin/env python3
 import argparse
+import base64
 import datetime as dt
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import orjson
+
 from .config import DEFAULT_BLOCK_MAP, OUTPUT_DIR, REPO_ROOT
+from .fileio import copy_file_atomic
+
+
+UPLOAD_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+CRC32C_CHUNK_SIZE = 1024 * 1024
+
+
+def _hardware_crc32c():
+    """Return the google_crc32c module when its C extension is available, else None.
+
+    The pure-Python fallback is slow enough that re-uploading beats hashing.
+    """
+    try:
+        import google_crc32c  # type: ignore  # installed with google-cloud-storage
+    except ImportError:
+        return None
+    return google_crc32c if google_crc32c.implementation == "c" else None
+
+
+def _file_crc32c(path: Path, crc32c) -> str:
+    """Return path's CRC32C in the base64 form GCS reports as Blob.crc32c."""
+    checksum = crc32c.Checksum()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(CRC32C_CHUNK_SIZE), b""):
+            checksum.update(chunk)
+    return base64.b64encode(checksum.digest()).decode("ascii")
+
+
+UPLOAD_IGNORED_NAMES = frozenset({".DS_Store", ".git"})
+
 
+def _iter_upload_files(root: Path, rel_dir: str = ""):
+    """Yield (path, posix relative name) for regular files under root, depth first.
 
-def _upload_directory_to_gcs(local_dir: Path, bucket_name: str, prefix: str = "") -> None:
+    Symlinks and UPLOAD_IGNORED_NAMES are skipped; only one directory listing
+    is held open per level.
+    """
+    with os.scandir(root / rel_dir if rel_dir else root) as entries:
+        for entry in entries:
+            if entry.name in UPLOAD_IGNORED_NAMES or entry.is_symlink():
+                continue
+            rel_name = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_upload_files(root, rel_name)
+            elif entry.is_file(follow_symlinks=False):
+                yield Path(entry.path), rel_name
+
+
+def _upload_directory_to_gcs(
+    local_dir: Path, bucket_name: str, prefix: str = "", max_workers: int = UPLOAD_WORKERS
+) -> None:
     """Upload all files under local_dir to a GCS bucket, preserving structure.
 
     Objects are written as "<prefix>/<relative_path>" (prefix omitted if empty).
+    Objects whose remote CRC32C already matches the local file are skipped.
+    Uploads run on max_workers threads; failures are reported per file and
+    raised together once every upload has finished.
     Requires Application Default Credentials (e.g. `gcloud auth application-default login`).
     """
     try:
         from google.cloud import storage  # type: ignore
+        from google.cloud.storage import transfer_manager  # type: ignore
     except Exception as e:
         raise RuntimeError(
-            "google-cloud-storage is required. Please install dependencies and retry."
+            "google-cloud-storage>=2.14 is required. Please install dependencies and retry."
         ) from e
 
     client = storage.Client()
     bucket = client.bucket(bucket_name)
+    max_workers = max(1, max_workers)
 
     root = Path(local_dir).resolve()
     if not root.exists():
         print(f"Local directory not found: {root}")
         return
 
+    blob_prefix = f"{Path(prefix).as_posix()}/" if prefix else ""
+    uploads = [(path, rel_name, f"{blob_prefix}{rel_name}") for path, rel_name in _iter_upload_files(root)]
+
+    # One listing call tells us which objects are already up to date.
+    remote_crc32c = {blob.name: blob.crc32c for blob in client.list_blobs(bucket, prefix=blob_prefix or None)}
+
+    crc32c = _hardware_crc32c()
+
+    def is_stale(item):
+        path, _rel_name, blob_name = item
+        remote = remote_crc32c.get(blob_name)
+        if remote is None or crc32c is None:
+            return True
+        try:
+            return _file_crc32c(path, crc32c) != remote
+        except OSError:
+            return True
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        changed = [item for item, stale in zip(uploads, executor.map(is_stale, uploads)) if stale]
+
+    results = []
+    if changed:
+        results = transfer_manager.upload_many_from_filenames(
+            bucket,
+            [rel_name for _path, rel_name, _blob_name in changed],
+            source_directory=str(root),
+            blob_name_prefix=blob_prefix,
+            upload_kwargs={"checksum": "crc32c"},
+            max_workers=max_workers,
+            worker_type=transfer_manager.THREAD,
+        )
+
     uploaded = 0
-    for path in root.rglob("*"):
-        if not path.is_file():
+    failed = 0
+    for (path, _rel_name, blob_name), result in zip(changed, results):
+        if isinstance(result, Exception):
+            failed += 1
+            print(f"Failed {path} -> gs://{bucket_name}/{blob_name}: {result}")
             continue
-        rel_path = path.relative_to(root)
-        blob_name_path = Path(prefix) / rel_path if prefix else rel_path
-        blob_name = str(blob_name_path).replace("\\", "/")
-        blob = bucket.blob(blob_name)
-        blob.upload_from_filename(str(path))
         uploaded += 1
         print(f"Uploaded {path} -> gs://{bucket_name}/{blob_name}")
 
-    if uploaded == 0:
+    if failed:
+        raise RuntimeError(f"{failed} of {len(changed)} uploads failed")
+    if not uploads:
         print(f"No files found to upload in {root}")
     else:
-        print(f"Uploaded {uploaded} files to gs://{bucket_name}/{prefix}".rstrip("/"))
+        unchanged = len(uploads) - len(changed)
+        print(f"Uploaded {uploaded} files ({unchanged} unchanged) to gs://{bucket_name}/{prefix}".rstrip("/"))
 
 
 def main() -> int:
@@ -71,6 +163,17 @@ def main() -> int:
         action="store_true",
         help="Do not upload to GCS even if --bucket is provided",
     )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=UPLOAD_WORKERS,
+        help=f"Concurrent GCS uploads (default {UPLOAD_WORKERS})",
+    )
+    parser.add_argument(
+        "--no-validate",
+        action="store_true",
+        help="Skip parsing the source block map before copying (invalid JSON is refused by default)",
+    )
     args = parser.parse_args()
 
     qa_block_map = DEFAULT_BLOCK_MAP
@@ -82,15 +185,15 @@ def main() -> int:
         print(f"Source not found: {qa_block_map}")
         return 1
 
-    try:
-        with qa_block_map.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-    except Exception as e:
-        print(f"Invalid JSON in {qa_block_map}: {e}")
-        return 2
+    if not args.no_validate:
+        try:
+            orjson.loads(qa_block_map.read_bytes())
+        except Exception as e:
+            print(f"Invalid JSON in {qa_block_map}: {e}")
+            return 2
 
-    with out_file.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    # The crawler already writes block_map.json pretty-printed, so copy it as is.
+    copy_file_atomic(qa_block_map, out_file)
 
     print(f"Wrote {out_file}")
 
@@ -98,7 +201,7 @@ def main() -> int:
     if args.bucket and not args.no_upload:
         output_root = REPO_ROOT / "output"
         try:
-            _upload_directory_to_gcs(output_root, args.bucket, args.gcs_prefix)
+            _upload_directory_to_gcs(output_root, args.bucket, args.gcs_prefix, args.parallel)
         except Exception as e:
             print(f"Upload to GCS failed: {e}")
             return 3
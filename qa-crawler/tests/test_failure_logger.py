@@ -0,0 +1,35 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import orjson
+
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from qa_crawler.loggers import failure_logger  # noqa: E402
+
+
+def test_write_logs_appends_one_record_per_failure(tmp_path, monkeypatch):
+    log_path = tmp_path / "failed_urls.jsonl"
+    monkeypatch.setattr(failure_logger, "FAILED_URLS_PATH", log_path)
+
+    first_run = failure_logger.FailureLogger()
+    asyncio.run(first_run.log(None, "https://a.example/1", "control", error="boom"))
+    asyncio.run(first_run.log(None, "https://a.example/2", "control"))  # no error, not recorded
+    first_run.write_logs()
+
+    second_run = failure_logger.FailureLogger()
+    asyncio.run(second_run.log(None, "https://a.example/1", "control", error="again"))
+    asyncio.run(second_run.log(None, "https://a.example/1", "experimental", error="boom"))
+    second_run.write_logs()
+
+    records = [orjson.loads(line) for line in log_path.read_bytes().splitlines()]
+    assert [(r["url"], r["environment"], r["error"]) for r in records] == [
+        ("https://a.example/1", "control", "boom"),
+        ("https://a.example/1", "control", "again"),
+        ("https://a.example/1", "experimental", "boom"),
+    ]
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+import orjson
+import pytest
+
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from qa_crawler import fileio  # noqa: E402
+
+
+def test_write_json_atomic_replaces_file_and_keeps_mode(tmp_path):
+    target = tmp_path / "nested" / "block_map.json"
+    fileio.write_json_atomic(target, {"a": 1})
+    assert orjson.loads(target.read_bytes()) == {"a": 1}
+    assert target.stat().st_mode & 0o777 == 0o644
+
+    target.chmod(0o664)
+    fileio.write_json_atomic(target, {"a": 2})
+    assert orjson.loads(target.read_bytes()) == {"a": 2}
+    assert target.stat().st_mode & 0o777 == 0o664
+    assert [p.name for p in target.parent.iterdir()] == ["block_map.json"]
+
+
+def test_atomic_writer_keeps_original_and_cleans_up_on_error(tmp_path):
+    target = tmp_path / "block_map.json"
+    target.write_bytes(b"old")
+    with pytest.raises(RuntimeError):
+        with fileio.atomic_writer(target) as handle:
+            handle.write(b"partial")
+            raise RuntimeError("boom")
+    assert target.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["block_map.json"]
+
+
+def test_concurrent_writers_use_separate_temp_files(tmp_path):
+    target = tmp_path / "block_map.json"
+    with fileio.atomic_writer(target) as first, fileio.atomic_writer(target) as second:
+        assert first.name != second.name
+        first.write(b"first")
+        second.write(b"second")
+    assert target.read_bytes() == b"first"
+
+
+def test_copy_file_atomic(tmp_path):
+    src = tmp_path / "src.json"
+    src.write_bytes(b'{"x": 1}')
+    fileio.copy_file_atomic(src, tmp_path / "out" / "block_map.json")
+    assert (tmp_path / "out" / "block_map.json").read_bytes() == b'{"x": 1}'
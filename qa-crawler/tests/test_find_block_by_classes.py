@@ -0,0 +1,60 @@
+import importlib.util
+from pathlib import Path
+
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+SCRIPT_PATH = PROJECT_DIR / "scripts" / "find_block_by_classes.py"
+
+spec = importlib.util.spec_from_file_location("find_block_by_classes", str(SCRIPT_PATH))
+fbc = importlib.util.module_from_spec(spec)
+assert spec and spec.loader
+spec.loader.exec_module(fbc)  # type: ignore
+
+
+def make_block_map():
+    return {
+        "h1": {"class_names": ["ax-columns", "fullsize", "width-2-columns"], "urls": ["https://a.example/cols"]},
+        "h2": {"class_names": ["ax-columns", "center"], "urls": ["https://a.example/cols2"]},
+        "h3": {"class_names": ["Hero", "centered"], "urls": ["https://a.example/hero"]},
+        "h4": {"class_names": ["banner"], "urls": ["https://a.example/banner"]},
+    }
+
+
+def test_normalize_classes_splits_commas_and_dedupes():
+    assert fbc.normalize_classes(["Hero,centered", "hero", " wide "]) == ["hero", "centered", "wide"]
+
+
+def test_find_exact_match_ignores_order_and_case():
+    entries = fbc.prepare_entries(make_block_map())
+    entry_id, entry = fbc.find_exact_match(["centered", "hero"], entries)
+    assert entry_id == "h3"
+    assert entry["urls"] == ["https://a.example/hero"]
+
+
+def test_find_exact_match_with_class_index():
+    entries = fbc.prepare_entries(make_block_map())
+    class_index = fbc.build_class_index(entries)
+    assert fbc.find_exact_match(["fullsize", "width-2-columns", "ax-columns"], entries, class_index)[0] == "h1"
+    assert fbc.find_exact_match(["ax-columns"], entries, class_index) == ("", {})
+    assert fbc.find_exact_match(["unknown", "banner"], entries, class_index) == ("", {})
+
+
+def test_find_exact_match_missing():
+    entries = fbc.prepare_entries(make_block_map())
+    assert fbc.find_exact_match(["hero"], entries) == ("", {})
+
+
+def test_rank_close_matches_orders_by_jaccard():
+    entries = fbc.prepare_entries(make_block_map())
+    class_index = fbc.build_class_index(entries)
+    matches = fbc.rank_close_matches(["ax-columns", "fullsize"], entries, class_index, top_k=5)
+    ids = [match_id for match_id, _score, _entry in matches]
+    assert ids == ["h1", "h2"]
+    scores = [score for _id, score, _entry in matches]
+    assert scores[0] == 2 / 3
+    assert scores[1] == 1 / 3
+
+
+def test_rank_close_matches_no_shared_classes():
+    entries = fbc.prepare_entries(make_block_map())
+    assert fbc.rank_close_matches(["unknown"], entries, fbc.build_class_index(entries)) == []
@@ -0,0 +1,122 @@
+import gzip
+import importlib.util
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+import boto3
+import orjson
+import pytest
+from botocore.response import StreamingBody
+from botocore.stub import Stubber
+
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = PROJECT_DIR / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+def load_script(name):
+    spec = importlib.util.spec_from_file_location(name, str(SCRIPTS_DIR / f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)  # type: ignore
+    return module
+
+
+download_from_s3 = load_script("download_from_s3")
+sync_block_map_s3 = load_script("sync_block_map_s3")
+
+BUCKET = "express-block-maps"
+KEY = "block_map.json"
+BLOCK_MAP = {"abc": {"class_names": ["hero", "centered"], "urls": ["https://a.example/hero"]}}
+
+
+def make_client():
+    return boto3.client("s3", region_name="us-east-2", aws_access_key_id="x", aws_secret_access_key="x")
+
+
+def streaming(body):
+    return StreamingBody(io.BytesIO(body), len(body))
+
+
+def test_decode_block_map_body():
+    raw = orjson.dumps(BLOCK_MAP)
+    assert download_from_s3.decode_block_map_body(gzip.compress(raw), "gzip") == raw
+    assert download_from_s3.decode_block_map_body(raw, None) == raw
+
+
+def test_upload_then_download_round_trip(tmp_path):
+    source = tmp_path / "block_map.json"
+    source.write_bytes(orjson.dumps(BLOCK_MAP, option=orjson.OPT_INDENT_2))
+
+    client = make_client()
+    uploaded = {}
+
+    def capture(params, **kwargs):
+        uploaded.update(params)
+        uploaded["Body"] = params["Body"].read()
+
+    client.meta.events.register("before-parameter-build.s3.PutObject", capture)
+    with Stubber(client) as stubber:
+        stubber.add_response("put_object", {}, None)
+        sync_block_map_s3.upload_block_map(client, BUCKET, KEY, source)
+        stubber.assert_no_pending_responses()
+    assert (uploaded["Bucket"], uploaded["Key"]) == (BUCKET, KEY)
+    assert uploaded["ContentType"] == "application/json"
+    assert uploaded["ContentEncoding"] == "gzip"
+    assert gzip.decompress(uploaded["Body"]) == source.read_bytes()
+
+    destination = tmp_path / "downloaded" / "block_map.json"
+    with Stubber(client) as stubber:
+        stubber.add_response(
+            "get_object",
+            {"Body": streaming(uploaded["Body"]), "ContentEncoding": "gzip"},
+            {"Bucket": BUCKET, "Key": KEY},
+        )
+        download_from_s3.download_block_map(BUCKET, KEY, destination, client=client)
+    assert orjson.loads(destination.read_bytes()) == BLOCK_MAP
+
+
+def test_download_accepts_legacy_uncompressed_body(tmp_path):
+    client = make_client()
+    destination = tmp_path / "block_map.json"
+    with Stubber(client) as stubber:
+        stubber.add_response("get_object", {"Body": streaming(orjson.dumps(BLOCK_MAP))}, {"Bucket": BUCKET, "Key": KEY})
+        download_from_s3.download_block_map(BUCKET, KEY, destination, client=client)
+    assert orjson.loads(destination.read_bytes()) == BLOCK_MAP
+
+
+def test_download_rejects_corrupt_gzip(tmp_path):
+    client = make_client()
+    destination = tmp_path / "block_map.json"
+    with Stubber(client) as stubber:
+        stubber.add_response(
+            "get_object",
+            {"Body": streaming(b"not gzip"), "ContentEncoding": "gzip"},
+            {"Bucket": BUCKET, "Key": KEY},
+        )
+        with pytest.raises(ValueError):
+            download_from_s3.download_block_map(BUCKET, KEY, destination, client=client)
+    assert not destination.exists()
+
+
+def test_archive_remote_block_map_cleans_up_on_corrupt_gzip(tmp_path, monkeypatch):
+    scratch = tmp_path / "scratch"
+    scratch.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(scratch))
+    body = b"not gzip"
+
+    client = make_client()
+    with Stubber(client) as stubber:
+        head = {"ContentLength": len(body), "ContentEncoding": "gzip"}
+        stubber.add_response("head_object", head, {"Bucket": BUCKET, "Key": KEY})
+        # download_file issues its own HEAD before fetching the object.
+        stubber.add_response("head_object", head, {"Bucket": BUCKET, "Key": KEY})
+        stubber.add_response("get_object", {"Body": streaming(body), "ContentEncoding": "gzip"}, None)
+        with pytest.raises(RuntimeError):
+            sync_block_map_s3.archive_remote_block_map(client, BUCKET, KEY, tmp_path / "archive", "2024-05-01")
+    assert list(scratch.iterdir()) == []
+    assert list((tmp_path / "archive").iterdir()) == []
@@ -1,9 +1,12 @@
 import sys
 from pathlib import Path
 
+import io
 import json
 import builtins
 
+import pytest
+
 
 # Ensure we can import the editable package without installation
 PROJECT_DIR = Path(__file__).resolve().parents[1]
@@ -11,10 +14,13 @@ SRC_DIR = PROJECT_DIR / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
+from qa_crawler import search  # noqa: E402
 from qa_crawler.search import (  # noqa: E402
     tokenize_query,
     exact_match_urls,
+    build_index,
     top_similar_combinations,
+    build_combinations,
     main as search_main,
 )
 
@@ -37,6 +43,19 @@ def test_exact_match_urls():
     assert all("centered" in bm[h]["class_names"] for h in bm if any(u in urls for u in bm[h].get("urls", [])))
 
 
+def test_exact_match_urls_with_index_keeps_block_map_order():
+    bm = make_block_map()
+    bm["hash6"] = {"class_names": ["Centered", "hero", "wide"], "urls": ["https://a.example/hero3", "https://a.example/hero1"]}
+    index = build_index(bm)
+    assert exact_match_urls(bm, ["centered", "hero"], index) == ["https://a.example/hero1", "https://a.example/hero3"]
+    assert exact_match_urls(bm, ["centered"], index) == [
+        "https://a.example/hero1",
+        "https://a.example/text1",
+        "https://a.example/hero3",
+    ]
+    assert exact_match_urls(bm, ["hero", "missing"], index) == []
+
+
 def test_top_similar_combinations_scores_sorted():
     bm = make_block_map()
     combos = top_similar_combinations(bm, "centered", top_k=5)
@@ -72,3 +91,68 @@ def test_cli_with_explicit_path(tmp_path, capsys, monkeypatch):
     assert "Exact match (all keywords):" in out
     assert "https://a.example/hero1" in out
     assert "Top 5 similar class name combinations" in out
+
+
+def test_top_similar_combinations_min_score_prunes():
+    bm = make_block_map()
+    all_combos = top_similar_combinations(bm, "hero centered", top_k=5)
+    pruned = top_similar_combinations(bm, "hero centered", top_k=5, min_score=90)
+    assert pruned
+    assert all(score >= 90 for _c, score, _h in pruned)
+    assert pruned == [combo for combo in all_combos if combo[1] >= 90]
+    assert len(pruned) < len(all_combos)
+
+
+@pytest.mark.parametrize("min_score", [-5, 101])
+def test_top_similar_combinations_rejects_out_of_range_min_score(min_score):
+    with pytest.raises(ValueError, match="min_score"):
+        top_similar_combinations(make_block_map(), "hero", min_score=min_score)
+
+
+def test_cli_rejects_out_of_range_min_score(tmp_path, capsys, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["search_block_map.py", "hero", "--path", str(tmp_path / "missing.json"), "--min-score", "150"])
+    with pytest.raises(SystemExit) as excinfo:
+        search_main()
+    assert excinfo.value.code == 2
+    assert "--min-score must be between 0 and 100" in capsys.readouterr().err
+
+
+def test_cli_repl_answers_each_stdin_query(tmp_path, capsys, monkeypatch):
+    bm_path = tmp_path / "block_map.json"
+    bm_path.write_text(json.dumps(make_block_map()), encoding="utf-8")
+
+    monkeypatch.setattr(sys, "argv", ["search_block_map.py", "--path", str(bm_path), "--repl"])
+    monkeypatch.setattr(sys, "stdin", io.StringIO("hero centered\n\nbanner\n"))
+    assert search_main() == 0
+    out = capsys.readouterr().out
+    assert out.count("Exact match (all keywords):") == 2
+    assert "> hero centered" in out and "> banner" in out
+    assert "https://a.example/hero1" in out
+    assert "https://a.example/banner1" in out
+
+
+def test_resolve_block_map_path_picks_latest_dated_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(search, "OUTPUT_DIR", tmp_path)
+    for name in ("2024-01-02", "2024-03-01", "2024-12-31-old", "notes"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "block_map.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "2025-01-01").mkdir()  # no block map yet
+    (tmp_path / "2026-01-01").write_text("", encoding="utf-8")  # a file, not a dir
+
+    assert search.resolve_block_map_path(None, None) == str(tmp_path / "2024-03-01" / "block_map.json")
+    assert search.resolve_block_map_path("2024-01-02", None) == str(tmp_path / "2024-01-02" / "block_map.json")
+
+
+def test_add_martech_off_appends_once_and_keeps_fragment():
+    assert search.add_martech_off("https://a.example/x") == "https://a.example/x?martech=off"
+    assert search.add_martech_off("https://a.example/x?a=1#top") == "https://a.example/x?a=1&martech=off#top"
+    assert search.add_martech_off("https://a.example/x?martech=on") == "https://a.example/x?martech=on"
+    assert search.add_martech_off("https://a.example/x?xmartech=1") == "https://a.example/x?xmartech=1&martech=off"
+
+
+def test_top_similar_combinations_accepts_prebuilt_combinations():
+    bm = make_block_map()
+    prebuilt = build_combinations(bm)
+    assert top_similar_combinations({}, "hero centered", combinations=prebuilt) == top_similar_combinations(
+        bm, "hero centered"
+    )
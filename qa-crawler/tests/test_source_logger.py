@@ -0,0 +1,140 @@
+import asyncio
+import hashlib
+import sys
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import orjson
+
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from qa_crawler.loggers import source_logger  # noqa: E402
+
+
+SNAPSHOT_HTML = """<!DOCTYPE html>
+<html><head><title>t</title></head><body>
+<header class="section"><div class="ignored"></div></header>
+<main>
+  <div class="section">
+    <!-- comment -->
+    <div class="hero centered">hero</div>
+    <div class="ax-columns-wrapper">
+      <div class="ax-columns fullsize"></div>
+      <span class="not-a-div"></span>
+    </div>
+    <p>plain text</p>
+  </div>
+  <div class="sectionx"><div class="not-in-section"></div></div>
+  <div class="theme section"><div class="banner">b</div></div>
+</main>
+</body></html>
+"""
+
+
+def block_hash(classes):
+    return hashlib.sha256(" ".join(sorted(classes)).encode()).hexdigest()
+
+
+def test_collect_html_blocks_returns_section_blocks():
+    blocks = source_logger._collect_html_blocks("https://main--site.example/express/page", SNAPSHOT_HTML.encode("utf-8"))
+
+    assert blocks == [
+        ["hero", "centered"],
+        ["ax-columns-wrapper"],
+        ["ax-columns", "fullsize"],
+        ["banner"],
+    ]
+
+
+def test_collect_html_blocks_tolerates_pages_without_main():
+    assert source_logger._collect_html_blocks("https://x.example/", b"<html><body><div class='section'></div></body></html>") == []
+
+
+class FakePage:
+    def is_closed(self):
+        return False
+
+    async def content(self):
+        return SNAPSHOT_HTML
+
+
+def test_log_parses_in_memory_and_write_logs_merges(tmp_path, monkeypatch):
+    monkeypatch.setattr(source_logger, "DOM_SNAPSHOT_DIR", tmp_path)
+    monkeypatch.setattr(source_logger, "SOURCE_FILES_PATH", tmp_path / "source_files.json")
+    monkeypatch.setattr(source_logger, "DEFAULT_BLOCK_MAP", tmp_path / "block_map.json")
+    url = "https://main--site.example/express/b"
+    banner = block_hash(["banner"])
+    (tmp_path / "block_map.json").write_bytes(
+        orjson.dumps({banner: {"class_names": ["banner"], "urls": ["https://main--site.example/express/a"]}})
+    )
+    (tmp_path / "source_files.json").write_bytes(orjson.dumps({url: ["https://x.example/express/code/blocks/a.js"]}))
+
+    logger = source_logger.SourceLogger()
+    logger.source_dict[url] = {
+        "https://x.example/express/code/blocks/b.js",
+        "https://x.example/express/code/blocks/a.js",
+    }
+    asyncio.run(logger.log(FakePage(), url, "control"))
+    snapshot = tmp_path / f"{url.replace('://', '_').replace('/', '_')}.html"
+    assert snapshot.read_text(encoding="utf-8") == SNAPSHOT_HTML
+    logger.write_logs()
+
+    block_map = orjson.loads((tmp_path / "block_map.json").read_bytes())
+    # In-memory keys are class tuples; the file stays keyed by SHA-256 digests.
+    assert len(block_map) == 4
+    assert block_map[banner]["urls"] == ["https://main--site.example/express/a", url]
+    assert block_map[block_hash(["hero", "centered"])]["urls"] == [url]
+    source_files = orjson.loads((tmp_path / "source_files.json").read_bytes())
+    assert source_files[url] == [
+        "https://x.example/express/code/blocks/a.js",
+        "https://x.example/express/code/blocks/b.js",
+    ]
+
+
+def test_log_uses_parse_pool_from_initialize(tmp_path, monkeypatch):
+    monkeypatch.setattr(source_logger, "DOM_SNAPSHOT_DIR", tmp_path)
+    url = "https://main--site.example/express/pool"
+
+    async def crawl_one():
+        logger = source_logger.SourceLogger()
+        await logger.initialize()
+        try:
+            assert logger.parse_pool is not None
+            await logger.log(FakePage(), url, "control")
+        finally:
+            logger.parse_pool.shutdown()
+        return logger
+
+    logger = asyncio.run(crawl_one())
+    assert tuple(sorted(["hero", "centered"])) in logger.block_map
+    assert len(logger.block_map) == 4
+
+
+class BrokenPool:
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("worker died")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+def test_log_falls_back_in_process_when_pool_breaks(tmp_path, monkeypatch):
+    monkeypatch.setattr(source_logger, "DOM_SNAPSHOT_DIR", tmp_path)
+    logger = source_logger.SourceLogger()
+    broken = BrokenPool()
+    logger.parse_pool = broken
+
+    asyncio.run(logger.log(FakePage(), "https://main--site.example/express/a", "control"))
+    asyncio.run(logger.log(FakePage(), "https://main--site.example/express/b", "control"))
+
+    assert broken.shut_down
+    assert logger.parse_pool is None
+    assert len(logger.block_map) == 4
+    assert all(len(entry["urls"]) == 2 for entry in logger.block_map.values())
@@ -0,0 +1,168 @@
+import base64
+import sys
+import types
+import zlib
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from qa_crawler import sync  # noqa: E402
+
+
+def run_sync_main(tmp_path, monkeypatch, source_bytes, *extra_args):
+    source = tmp_path / "data" / "block_map.json"
+    source.parent.mkdir(parents=True)
+    source.write_bytes(source_bytes)
+    monkeypatch.setattr(sync, "DEFAULT_BLOCK_MAP", source)
+    monkeypatch.setattr(sync, "OUTPUT_DIR", tmp_path / "output")
+    monkeypatch.setattr(sys, "argv", ["sync.py", "--date", "2024-05-01", "--no-upload", *extra_args])
+    return sync.main(), tmp_path / "output" / "2024-05-01" / "block_map.json"
+
+
+def test_main_copies_valid_block_map_verbatim(tmp_path, monkeypatch):
+    body = b'{\n  "abc": {\n    "class_names": ["foo"],\n    "urls": ["u1"]\n  }\n}'
+    rc, out_file = run_sync_main(tmp_path, monkeypatch, body)
+    assert rc == 0
+    assert out_file.read_bytes() == body
+    assert [p.name for p in out_file.parent.iterdir()] == ["block_map.json"]
+
+
+def test_main_rejects_invalid_json_unless_opted_out(tmp_path, monkeypatch):
+    rc, out_file = run_sync_main(tmp_path, monkeypatch, b'{"abc": ')
+    assert rc == 2
+    assert not out_file.exists()
+
+
+def test_main_no_validate_copies_without_parsing(tmp_path, monkeypatch):
+    rc, out_file = run_sync_main(tmp_path, monkeypatch, b'{"abc": ', "--no-validate")
+    assert rc == 0
+    assert out_file.read_bytes() == b'{"abc": '
+
+
+class FakeChecksum:
+    def __init__(self):
+        self.value = 0
+
+    def update(self, chunk):
+        self.value = zlib.crc32(chunk, self.value)
+
+    def digest(self):
+        return self.value.to_bytes(4, "big")
+
+
+def fake_crc32c(data):
+    checksum = FakeChecksum()
+    checksum.update(data)
+    return base64.b64encode(checksum.digest()).decode("ascii")
+
+
+class FakeClient:
+    def __init__(self, remote_crc32c):
+        self.remote_crc32c = remote_crc32c
+        self.listed_prefixes = []
+
+    def bucket(self, name):
+        return types.SimpleNamespace(name=name)
+
+    def list_blobs(self, bucket, prefix=None):
+        self.listed_prefixes.append(prefix)
+        return [
+            types.SimpleNamespace(name=name, crc32c=crc32c)
+            for name, crc32c in self.remote_crc32c.items()
+            if name.startswith(prefix or "")
+        ]
+
+
+def install_fake_gcs(monkeypatch, remote_crc32c, implementation="c", fail=()):
+    client = FakeClient(remote_crc32c)
+    calls = []
+
+    def upload_many_from_filenames(bucket, filenames, **kwargs):
+        calls.append({"filenames": list(filenames), **kwargs})
+        return [RuntimeError("denied") if name in fail else None for name in filenames]
+
+    transfer_manager = types.ModuleType("google.cloud.storage.transfer_manager")
+    transfer_manager.THREAD = "thread"
+    transfer_manager.upload_many_from_filenames = upload_many_from_filenames
+    storage = types.ModuleType("google.cloud.storage")
+    storage.Client = lambda: client
+    storage.transfer_manager = transfer_manager
+    cloud = types.ModuleType("google.cloud")
+    cloud.storage = storage
+    google = types.ModuleType("google")
+    google.cloud = cloud
+    crc32c = types.ModuleType("google_crc32c")
+    crc32c.implementation = implementation
+    crc32c.Checksum = FakeChecksum
+    for name, module in {
+        "google": google,
+        "google.cloud": cloud,
+        "google.cloud.storage": storage,
+        "google.cloud.storage.transfer_manager": transfer_manager,
+        "google_crc32c": crc32c,
+    }.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    return client, calls
+
+
+def make_output_tree(tmp_path):
+    root = tmp_path / "output"
+    (root / "2024-05-01").mkdir(parents=True)
+    (root / "same.json").write_bytes(b"same")
+    (root / "changed.json").write_bytes(b"new contents")
+    (root / "2024-05-01" / "block_map.json").write_bytes(b"{}")
+    (root / ".DS_Store").write_bytes(b"")
+    return root
+
+
+def test_upload_skips_blobs_with_matching_crc32c(tmp_path, monkeypatch):
+    root = make_output_tree(tmp_path)
+    client, calls = install_fake_gcs(
+        monkeypatch,
+        {"output/same.json": fake_crc32c(b"same"), "output/changed.json": fake_crc32c(b"old contents")},
+    )
+
+    sync._upload_directory_to_gcs(root, "bucket", "output/", max_workers=2)
+
+    assert client.listed_prefixes == ["output/"]
+    assert len(calls) == 1
+    assert sorted(calls[0]["filenames"]) == ["2024-05-01/block_map.json", "changed.json"]
+    assert calls[0]["source_directory"] == str(root.resolve())
+    assert calls[0]["blob_name_prefix"] == "output/"
+    assert calls[0]["worker_type"] == "thread"
+
+
+def test_upload_lists_blobs_under_normalized_prefix(tmp_path, monkeypatch):
+    root = make_output_tree(tmp_path)
+    client, calls = install_fake_gcs(monkeypatch, {"output/same.json": fake_crc32c(b"same")})
+
+    sync._upload_directory_to_gcs(root, "bucket", "./output")
+
+    assert client.listed_prefixes == ["output/"]
+    assert sorted(calls[0]["filenames"]) == ["2024-05-01/block_map.json", "changed.json"]
+    assert calls[0]["blob_name_prefix"] == "output/"
+
+
+def test_upload_without_c_extension_uploads_everything(tmp_path, monkeypatch):
+    root = make_output_tree(tmp_path)
+    client, calls = install_fake_gcs(monkeypatch, {"same.json": fake_crc32c(b"same")}, implementation="python")
+
+    sync._upload_directory_to_gcs(root, "bucket")
+
+    assert client.listed_prefixes == [None]
+    assert sorted(calls[0]["filenames"]) == ["2024-05-01/block_map.json", "changed.json", "same.json"]
+    assert calls[0]["blob_name_prefix"] == ""
+
+
+def test_upload_raises_after_reporting_failures(tmp_path, monkeypatch):
+    root = make_output_tree(tmp_path)
+    install_fake_gcs(monkeypatch, {}, fail={"changed.json"})
+
+    with pytest.raises(RuntimeError, match="1 of 3 uploads failed"):
+        sync._upload_directory_to_gcs(root, "bucket")
@@ -63,7 +63,7 @@ def test_sync_rejects_invalid_json(tmp_path, monkeypatch):
 
     # Write invalid JSON
     src_path = data_qa / "block_map.json"
-    src_path.write_text("{"""not-json"""}", encoding="utf-8")
+    src_path.write_text("{not-json}", encoding="utf-8")
 
     script_dir = repo_root / "scripts"
     script_dir.mkdir(parents=True, exist_ok=True)